@@ -1,11 +1,19 @@
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 
 from rq_dashboard_fast.rq_dashboard_fast import RedisQueueDashboard
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await dashboard.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 PORT = int(os.getenv("FASTAPI_PORT", 8000))
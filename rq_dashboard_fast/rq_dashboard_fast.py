@@ -1,18 +1,24 @@
+import asyncio
+import contextlib
+import hashlib
 import logging
+import time
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Query, Request, Depends, status
-from fastapi.responses import HTMLResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from starlette.staticfiles import StaticFiles
-from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from starlette.middleware.authentication import AuthenticationMiddleware
-from redis import Redis
+from jinja2 import Environment, FileSystemLoader
+from redis import BlockingConnectionPool, Redis
+import orjson
 import secrets
 
 from rq_dashboard_fast.utils.jobs import (
-    JobDataDetailed,
     QueueJobRegistryStats,
     delete_job_id,
     get_job,
@@ -25,8 +31,65 @@ from rq_dashboard_fast.utils.queues import (
 )
 from rq_dashboard_fast.utils.workers import WorkerData, get_workers
 
+PACKAGE_DIRECTORY = Path(__file__).resolve().parent
+STATIC_DIRECTORY = PACKAGE_DIRECTORY / "static"
+TEMPLATES_DIRECTORY = PACKAGE_DIRECTORY / "templates"
+
+# Matches the 5 second auto-refresh of the worker and queue pages.
+REFRESH_INTERVAL = 5.0
+REFRESH_IDLE_TIMEOUT = 30.0
+
+logger = logging.getLogger(__name__)
+
 security = HTTPBasic()
 
+
+def make_verify_credentials(username: str, password: str):
+    expected_username = username.encode()
+    expected_password = password.encode()
+
+    async def verify_credentials(
+        credentials: HTTPBasicCredentials = Depends(security),
+    ):
+        correct_username = secrets.compare_digest(
+            credentials.username.encode(), expected_username
+        )
+        correct_password = secrets.compare_digest(
+            credentials.password.encode(), expected_password
+        )
+        # Bitwise & so the password is always compared, whatever the username.
+        if not (correct_username & correct_password):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect username or password",
+                headers={"WWW-Authenticate": "Basic"},
+            )
+        return credentials.username
+
+    return verify_credentials
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/ validators match as well.
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+class CachedStaticFiles(StaticFiles):
+    # Asset URLs carry the dashboard version, so browsers may keep them for good.
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+@lru_cache(maxsize=None)
+def get_redis_connection(redis_url: str) -> Redis:
+    return Redis(
+        connection_pool=BlockingConnectionPool.from_url(redis_url, max_connections=32)
+    )
+
+
 class RedisQueueDashboard(FastAPI):
     def __init__(
         self,
@@ -34,53 +97,62 @@ class RedisQueueDashboard(FastAPI):
         prefix: str = "/rq",
         username: str = "admin",
         password: str = "admin",
+        refresh_interval: float = REFRESH_INTERVAL,
+        refresh_idle_timeout: float = REFRESH_IDLE_TIMEOUT,
         *args,
         **kwargs
     ):
+        kwargs.setdefault("default_response_class", ORJSONResponse)
         super().__init__(root_path=prefix, *args, **kwargs)
 
-        package_directory = Path(__file__).resolve().parent
-        static_directory = package_directory / "static"
+        self.mount(
+            "/static", CachedStaticFiles(directory=STATIC_DIRECTORY), name="static"
+        )
 
-        self.mount("/static", StaticFiles(directory=static_directory), name="static")
+        self.templates = Jinja2Templates(
+            env=Environment(
+                loader=FileSystemLoader(TEMPLATES_DIRECTORY),
+                autoescape=True,
+                auto_reload=False,
+            )
+        )
+        for template_name in self.templates.env.list_templates():
+            self.templates.env.get_template(template_name)
 
-        templates_directory = package_directory / "templates"
-        self.templates = Jinja2Templates(directory=templates_directory)
         self.redis_url = redis_url
+        self.redis = get_redis_connection(redis_url)
         self.username = username
         self.password = password
+        self._verify_credentials = make_verify_credentials(username, password)
+        auth_dependencies = [Depends(self._verify_credentials)]
 
         self.rq_dashboard_version = "0.4.0"
 
-        logger = logging.getLogger(__name__)
-
-        async def verify_credentials(
-            credentials: HTTPBasicCredentials = Depends(security)
-        ):
-            correct_username = secrets.compare_digest(credentials.username, self.username)
-            correct_password = secrets.compare_digest(credentials.password, self.password)
-            if not (correct_username and correct_password):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Incorrect username or password",
-                    headers={"WWW-Authenticate": "Basic"},
-                )
-            return credentials.username
-
-        @self.get("/", response_class=HTMLResponse, dependencies=[Depends(verify_credentials)])
+        # Worker and queue pages are served from snapshots that one background
+        # task refreshes, however many dashboards are polling them.
+        self._snapshot_sources = {
+            "workers": get_workers,
+            "queues": get_job_registry_amount,
+        }
+        self.refresh_interval = refresh_interval
+        self.refresh_idle_timeout = refresh_idle_timeout
+        self._snapshots = {}
+        self._snapshot_generations = defaultdict(int)
+        self._snapshot_locks = defaultdict(asyncio.Lock)
+        self._refresh_task = None
+        self._last_snapshot_read = 0.0
+        self.add_event_handler("shutdown", self.close)
+        self._json_bodies = {}
+
+        self._base_context = {
+            "prefix": prefix,
+            "rq_dashboard_version": self.rq_dashboard_version,
+        }
+
+        @self.get("/", response_class=HTMLResponse, dependencies=auth_dependencies)
         async def get_home(request: Request):
             try:
-                protocol = request.url.scheme
-                return self.templates.TemplateResponse(
-                    "base.html",
-                    {
-                        "request": request,
-                        "active_tab": "jobs",
-                        "prefix": prefix,
-                        "rq_dashboard_version": self.rq_dashboard_version,
-                        "protocol": protocol,
-                    },
-                )
+                return self._render("base.html", request, active_tab="jobs")
             except Exception as e:
                 logger.exception(
                     "An error occurred while loading the base template:", e
@@ -90,25 +162,16 @@ class RedisQueueDashboard(FastAPI):
                     detail="An error occurred while loading the base template.",
                 )
 
-        @self.get("/workers", response_class=HTMLResponse, dependencies=[Depends(verify_credentials)])
+        @self.get("/workers", response_class=HTMLResponse, dependencies=auth_dependencies)
         async def read_workers(request: Request):
             try:
-                worker_data = get_workers(self.redis_url)
+                worker_data = await self._snapshot("workers")
 
-                active_tab = "workers"
-
-                protocol = request.url.scheme
-
-                return self.templates.TemplateResponse(
+                return self._render(
                     "workers.html",
-                    {
-                        "request": request,
-                        "worker_data": worker_data,
-                        "active_tab": active_tab,
-                        "prefix": prefix,
-                        "rq_dashboard_version": self.rq_dashboard_version,
-                        "protocol": protocol,
-                    },
+                    request,
+                    active_tab="workers",
+                    worker_data=worker_data,
                 )
             except Exception as e:
                 logger.exception("An error occurred while reading workers:", e)
@@ -117,12 +180,12 @@ class RedisQueueDashboard(FastAPI):
                     detail="An error occurred while reading workers.",
                 )
 
-        @self.get("/workers/json", response_model=list[WorkerData], dependencies=[Depends(verify_credentials)])
-        async def read_workers():
+        @self.api_route("/workers/json", methods=["GET", "HEAD"], response_class=ORJSONResponse, responses={200: {"model": list[WorkerData]}}, dependencies=auth_dependencies)
+        async def read_workers_json(request: Request):
             try:
-                worker_data = get_workers(self.redis_url)
+                worker_data = await self._snapshot("workers")
 
-                return worker_data
+                return self._json(request, worker_data, cache_key="workers")
             except Exception as e:
                 logger.exception(
                     "An error occurred while reading worker data in json:", e
@@ -132,10 +195,13 @@ class RedisQueueDashboard(FastAPI):
                     detail="An error occurred while reading worker data in json.",
                 )
 
-        @self.delete("/queues/{queue_name}", dependencies=[Depends(verify_credentials)])
-        def delete_jobs_in_queue(queue_name: str):
+        @self.delete("/queues/{queue_name}", dependencies=auth_dependencies)
+        async def delete_jobs_in_queue(queue_name: str):
             try:
-                deleted_ids = delete_jobs_for_queue(queue_name, self.redis_url)
+                deleted_ids = await run_in_threadpool(
+                    delete_jobs_for_queue, queue_name, self.redis
+                )
+                self._invalidate_snapshot("queues")
                 return deleted_ids
             except Exception as e:
                 logger.exception("An error occurred while deleting jobs in queue:", e)
@@ -144,25 +210,13 @@ class RedisQueueDashboard(FastAPI):
                     detail="An error occurred while deleting jobs in queue.",
                 )
 
-        @self.get("/queues", response_class=HTMLResponse, dependencies=[Depends(verify_credentials)])
+        @self.get("/queues", response_class=HTMLResponse, dependencies=auth_dependencies)
         async def read_queues(request: Request):
             try:
-                queue_data = get_job_registry_amount(self.redis_url)
-
-                active_tab = "queues"
-
-                protocol = request.url.scheme
-
-                return self.templates.TemplateResponse(
-                    "queues.html",
-                    {
-                        "request": request,
-                        "queue_data": queue_data,
-                        "active_tab": active_tab,
-                        "prefix": prefix,
-                        "rq_dashboard_version": self.rq_dashboard_version,
-                        "protocol": protocol,
-                    },
+                queue_data = await self._snapshot("queues")
+
+                return self._render(
+                    "queues.html", request, active_tab="queues", queue_data=queue_data
                 )
             except Exception as e:
                 logger.exception("An error occurred reading queues data template:", e)
@@ -171,12 +225,12 @@ class RedisQueueDashboard(FastAPI):
                     detail="An error occurred reading queues data template.",
                 )
 
-        @self.get("/queues/json", response_model=list[QueueRegistryStats], dependencies=[Depends(verify_credentials)])
-        async def read_queues():
+        @self.api_route("/queues/json", methods=["GET", "HEAD"], response_class=ORJSONResponse, responses={200: {"model": list[QueueRegistryStats]}}, dependencies=auth_dependencies)
+        async def read_queues_json(request: Request):
             try:
-                queue_data = get_job_registry_amount(self.redis_url)
+                queue_data = await self._snapshot("queues")
 
-                return queue_data
+                return self._json(request, queue_data, cache_key="queues")
             except Exception as e:
                 logger.exception("An error occurred reading queues data json:", e)
                 raise HTTPException(
@@ -184,7 +238,7 @@ class RedisQueueDashboard(FastAPI):
                     detail="An error occurred reading queues data json.",
                 )
 
-        @self.get("/jobs", response_class=HTMLResponse, dependencies=[Depends(verify_credentials)])
+        @self.get("/jobs", response_class=HTMLResponse, dependencies=auth_dependencies)
         async def read_jobs(
             request: Request,
             queue_name: str = Query("all"),
@@ -192,22 +246,12 @@ class RedisQueueDashboard(FastAPI):
             page: int = Query(1),
         ):
             try:
-                job_data = get_jobs(self.redis_url, queue_name, state, page=page)
-
-                active_tab = "jobs"
-
-                protocol = request.url.scheme
-
-                return self.templates.TemplateResponse(
-                    "jobs.html",
-                    {
-                        "request": request,
-                        "job_data": job_data,
-                        "active_tab": active_tab,
-                        "prefix": prefix,
-                        "rq_dashboard_version": self.rq_dashboard_version,
-                        "protocol": protocol,
-                    },
+                job_data = await run_in_threadpool(
+                    get_jobs, self.redis, queue_name, state, page=page
+                )
+
+                return self._render(
+                    "jobs.html", request, active_tab="jobs", job_data=job_data
                 )
             except Exception as e:
                 logger.exception("An error occurred reading jobs data template:", e)
@@ -216,16 +260,19 @@ class RedisQueueDashboard(FastAPI):
                     detail="An error occurred reading jobs data template.",
                 )
 
-        @self.get("/jobs/json", response_model=list[QueueJobRegistryStats], dependencies=[Depends(verify_credentials)])
-        async def read_jobs(
+        @self.api_route("/jobs/json", methods=["GET", "HEAD"], response_class=ORJSONResponse, responses={200: {"model": list[QueueJobRegistryStats]}}, dependencies=auth_dependencies)
+        async def read_jobs_json(
+            request: Request,
             queue_name: str = Query("all"),
             state: str = Query("all"),
             page: int = Query(1),
         ):
             try:
-                job_data = get_jobs(self.redis_url, queue_name, state, page=page)
+                job_data = await run_in_threadpool(
+                    get_jobs, self.redis, queue_name, state, page=page
+                )
 
-                return job_data
+                return self._json(request, job_data)
             except Exception as e:
                 logger.exception("An error occurred reading jobs data json:", e)
                 raise HTTPException(
@@ -233,26 +280,12 @@ class RedisQueueDashboard(FastAPI):
                     detail="An error occurred reading jobs data json.",
                 )
 
-        @self.get("/job/{job_id}", response_model=JobDataDetailed, dependencies=[Depends(verify_credentials)])
+        @self.get("/job/{job_id}", response_class=HTMLResponse, dependencies=auth_dependencies)
         async def get_job_data(job_id: str, request: Request):
             try:
-                job = get_job(self.redis_url, job_id)
-
-                active_tab = "job"
-
-                protocol = request.url.scheme
-
-                return self.templates.TemplateResponse(
-                    "job.html",
-                    {
-                        "request": request,
-                        "job_data": job,
-                        "active_tab": active_tab,
-                        "prefix": prefix,
-                        "rq_dashboard_version": self.rq_dashboard_version,
-                        "protocol": protocol,
-                    },
-                )
+                job = await run_in_threadpool(get_job, self.redis, job_id)
+
+                return self._render("job.html", request, active_tab="job", job_data=job)
             except Exception as e:
                 logger.exception("An error occurred fetching a specific job:", e)
                 raise HTTPException(
@@ -260,13 +293,107 @@ class RedisQueueDashboard(FastAPI):
                     detail="An error occurred fetching a specific job.",
                 )
 
-        @self.delete("/job/{job_id}", dependencies=[Depends(verify_credentials)])
-        def delete_job(job_id: str):
+        @self.delete("/job/{job_id}", dependencies=auth_dependencies)
+        async def delete_job(job_id: str):
             try:
-                delete_job_id(self.redis_url, job_id=job_id)
+                await run_in_threadpool(delete_job_id, self.redis, job_id=job_id)
+                self._invalidate_snapshot("queues")
             except Exception as e:
                 logger.exception("An error occurred while deleting a job:", e)
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="An error occurred while deleting a job.",
                 )
+
+    def _context(self, request: Request, active_tab: str, **context) -> dict:
+        return {
+            **self._base_context,
+            "request": request,
+            "active_tab": active_tab,
+            "protocol": request.url.scheme,
+            **context,
+        }
+
+    def _render(self, name: str, request: Request, active_tab: str, **context):
+        return self.templates.TemplateResponse(
+            name, self._context(request, active_tab, **context)
+        )
+
+    async def _snapshot(self, key: str):
+        self._last_snapshot_read = time.monotonic()
+        self._start_refresh()
+        async with self._snapshot_locks[key]:
+            if key in self._snapshots:
+                return self._snapshots[key]
+            generation = self._snapshot_generations[key]
+            data = await run_in_threadpool(self._snapshot_sources[key], self.redis)
+            if self._snapshot_generations[key] == generation:
+                self._snapshots[key] = data
+            return data
+
+    def _invalidate_snapshot(self, key: str):
+        # Bumping the generation stops a fetch already in flight from storing
+        # data read before the change.
+        self._snapshot_generations[key] += 1
+        self._snapshots.pop(key, None)
+
+    def _start_refresh(self):
+        # A mounted dashboard never sees the host application's startup event,
+        # so the refresh task is started by the first read instead.
+        loop = asyncio.get_running_loop()
+        task = self._refresh_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        if task is not None and task.get_loop() is not loop:
+            # Snapshots kept by a task on a closed event loop are stale.
+            self._snapshots.clear()
+        self._refresh_task = loop.create_task(self._refresh_snapshots())
+
+    async def _refresh_snapshots(self):
+        while time.monotonic() - self._last_snapshot_read < self.refresh_idle_timeout:
+            await asyncio.sleep(self.refresh_interval)
+            for key in list(self._snapshots):
+                generation = self._snapshot_generations[key]
+                try:
+                    data = await run_in_threadpool(
+                        self._snapshot_sources[key], self.redis
+                    )
+                    if self._snapshot_generations[key] == generation:
+                        self._snapshots[key] = data
+                except Exception as e:
+                    # Let the next read fetch directly and report the error.
+                    self._snapshots.pop(key, None)
+                    logger.exception("An error occurred refreshing %s: %s", key, e)
+        # Nobody is watching; the next read starts over with fresh data.
+        self._snapshots.clear()
+
+    async def close(self):
+        # A mounted dashboard never sees the host application's shutdown event
+        # either, so hosts call this from their own shutdown or lifespan.
+        task = self._refresh_task
+        if task is None or task.done():
+            return
+        task.cancel()
+        if task.get_loop() is asyncio.get_running_loop():
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def _json(self, request: Request, data, cache_key: str | None = None) -> Response:
+        # Pollers get a 304 while the data is unchanged; the encoded body of
+        # cached data is kept so repeat polls skip encoding and hashing too.
+        cached = self._json_bodies.get(cache_key)
+        if cached is not None and cached[0] is data:
+            _, body, etag = cached
+        else:
+            body = orjson.dumps([item.model_dump(mode="json") for item in data])
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            if cache_key is not None:
+                self._json_bodies[cache_key] = (data, body, etag)
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(body))
+            return Response(media_type="application/json", headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
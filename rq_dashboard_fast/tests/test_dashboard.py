@@ -1,4 +1,5 @@
 import threading
+import time
 from random import randint
 
 import pytest
@@ -8,6 +9,7 @@ from redis import Redis
 from rq import Queue, Worker
 
 from rq_dashboard_fast import RedisQueueDashboard
+from rq_dashboard_fast import rq_dashboard_fast as dashboard_module
 
 worker_name = "test"
 queue_name = "test_queue"
@@ -29,7 +31,16 @@ def client():
     dashboard = RedisQueueDashboard(redis_url="redis://redis:6379", prefix="")
 
     app.mount("", dashboard)
-    return TestClient(app)
+    client = TestClient(app)
+    client.auth = ("admin", "admin")
+    return client
+
+
+@pytest.fixture
+def snapshot_queue(setup_redis):
+    queue = Queue(connection=setup_redis, name="snapshot_queue")
+    yield queue
+    queue.empty()
 
 
 @pytest.fixture
@@ -76,6 +87,17 @@ def test_get_job_data(client, add_task):
     assert job_id in response.text
 
 
+def test_get_job_data_escapes_html(client, create_queue):
+    job = create_queue.enqueue(example_task, "<script>alert(1)</script>")
+
+    response = client.get(f"/job/{job.id}")
+    assert response.status_code == 200
+    assert "<script>alert(1)</script>" not in response.text
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in response.text
+
+    job.delete()
+
+
 def test_get_jobs(client, add_task):
     job_id = add_task.id
 
@@ -116,14 +138,150 @@ def test_get_queue_json(client):
     assert any(queue["queue_name"] == queue_name for queue in response_read_json.json())
 
 
+def test_get_queue_json_not_modified(client, create_queue):
+    response = client.get("/queues/json")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response_cached = client.get("/queues/json", headers={"If-None-Match": etag})
+    assert response_cached.status_code == 304
+    assert response_cached.headers["etag"] == etag
+    assert response_cached.content == b""
+
+    for if_none_match in ("*", f"W/{etag}", f'"other", {etag}'):
+        response_cached = client.get(
+            "/queues/json", headers={"If-None-Match": if_none_match}
+        )
+        assert response_cached.status_code == 304
+
+
+def test_head_queue_json(client, create_queue):
+    response = client.get("/queues/json")
+
+    response_head = client.head("/queues/json")
+    assert response_head.status_code == 200
+    assert response_head.headers["etag"] == response.headers["etag"]
+    assert response_head.headers["content-length"] == str(len(response.content))
+    assert response_head.content == b""
+
+
 def test_get_queues(client):
     response = client.get("/queues")
 
     assert queue_name in response.text
 
 
+def test_get_workers(client, setup_redis):
+    worker = Worker([queue_name], connection=setup_redis, name="listed_worker")
+    worker.register_birth()
+    try:
+        response = client.get("/workers")
+    finally:
+        worker.register_death()
+
+    assert response.status_code == 200
+    assert "<td>listed_worker</td>" in response.text
+    assert queue_name in response.text
+    assert response.text.rstrip().endswith("</html>")
+
+
 def test_get_workers_json(client, setup_worker):
     response_read_json = client.get("/workers/json")
     assert response_read_json.status_code == 200
 
     assert len(response_read_json.json()) == 1
+
+
+def snapshot_client(**kwargs) -> TestClient:
+    dashboard = RedisQueueDashboard(redis_url="redis://redis:6379", prefix="", **kwargs)
+    client = TestClient(dashboard)
+    client.auth = ("admin", "admin")
+    return client
+
+
+def queued_count(client) -> int:
+    response = client.get("/queues/json")
+    assert response.status_code == 200
+    for queue in response.json():
+        if queue["queue_name"] == "snapshot_queue":
+            return queue["queued"]
+    return 0
+
+
+def wait_until(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def test_snapshot_first_read_loads_directly(snapshot_queue):
+    snapshot_queue.enqueue(example_task)
+
+    with snapshot_client(refresh_interval=60) as client:
+        queued = queued_count(client)
+        assert queued == snapshot_queue.count
+
+        # Until the next refresh, reads are answered from the snapshot.
+        snapshot_queue.enqueue(example_task)
+        assert queued_count(client) == queued
+
+
+def test_snapshot_background_refresh(snapshot_queue):
+    with snapshot_client(refresh_interval=0.01) as client:
+        queued = queued_count(client)
+
+        snapshot_queue.enqueue(example_task)
+        assert wait_until(lambda: queued_count(client) == queued + 1)
+
+
+def test_snapshot_cleared_by_delete(snapshot_queue):
+    snapshot_queue.enqueue(example_task)
+
+    with snapshot_client(refresh_interval=60) as client:
+        assert queued_count(client) > 0
+
+        response = client.delete("/queues/snapshot_queue")
+        assert response.status_code == 200
+
+        assert queued_count(client) == 0
+
+
+def test_snapshot_refresh_stops_when_idle(monkeypatch, snapshot_queue):
+    calls = []
+    get_job_registry_amount = dashboard_module.get_job_registry_amount
+
+    def counting_registry_amount(redis):
+        calls.append(redis)
+        return get_job_registry_amount(redis)
+
+    monkeypatch.setattr(
+        dashboard_module, "get_job_registry_amount", counting_registry_amount
+    )
+
+    def refresh_stopped() -> bool:
+        seen = len(calls)
+        time.sleep(0.3)
+        return len(calls) == seen
+
+    with snapshot_client(refresh_interval=0.01, refresh_idle_timeout=0.1) as client:
+        queued_count(client)
+        assert wait_until(lambda: len(calls) > 1)
+        assert wait_until(refresh_stopped)
+
+        # The stopped task dropped the snapshot, so this read loads directly.
+        stopped_at = len(calls)
+        snapshot_queue.enqueue(example_task)
+        assert queued_count(client) == snapshot_queue.count
+        assert len(calls) > stopped_at
+
+
+def test_snapshot_from_other_event_loop_discarded(snapshot_queue):
+    # Outside a with block every request runs on a fresh event loop.
+    client = snapshot_client(refresh_interval=60)
+    queued = queued_count(client)
+
+    snapshot_queue.enqueue(example_task)
+    assert queued_count(client) == queued + 1
@@ -1,6 +1,7 @@
 import pytest
 from rq import Queue
 from redis import Redis
+from rq.utils import current_timestamp
 from rq_scheduler import Scheduler
 from datetime import datetime
 from ..utils.jobs import (
@@ -34,11 +35,10 @@ def example_task():
 
 
 def test_get_job_registrys(setup_redis, setup_scheduler, setup_queue):
-    redis_url = "redis://redis:6379"
     job_name = "test_job"
     job = setup_queue.enqueue(example_task, description=job_name)
 
-    job_registrys = get_job_registrys(redis_url)
+    job_registrys = get_job_registrys(setup_redis)
 
     assert any(
         queue_job.queue_name == setup_queue.name
@@ -47,12 +47,27 @@ def test_get_job_registrys(setup_redis, setup_scheduler, setup_queue):
     )
 
 
+def test_get_job_registrys_lists_abandoned_jobs_as_failed(setup_redis):
+    queue = Queue(connection=setup_redis, name="abandoned_queue")
+    job = queue.enqueue(example_task, description="abandoned_job")
+    # A worker picked the job up and died; its started entry has expired.
+    queue.remove(job)
+    job.set_status("started")
+    setup_redis.zadd(queue.started_job_registry.key, {job.id: current_timestamp() - 100})
+
+    job_registrys = get_job_registrys(setup_redis, queue_name=queue.name)
+
+    assert [job_data.id for job_data in job_registrys[0].failed] == [job.id]
+    assert job_registrys[0].started == []
+
+    queue.failed_job_registry.remove(job, delete_job=True)
+
+
 def test_get_jobs(setup_redis, setup_scheduler, setup_queue):
-    redis_url = "redis://redis:6379"
     job_name = "test_job1"
     job = setup_queue.enqueue(example_task, description=job_name)
 
-    jobs = get_jobs(redis_url)
+    jobs = get_jobs(setup_redis)
 
     assert any(
         job_data.name == job_name for queue_job in jobs for job_data in queue_job.queued
@@ -60,20 +75,18 @@ def test_get_jobs(setup_redis, setup_scheduler, setup_queue):
 
 
 def test_get_job(setup_redis, setup_queue):
-    redis_url = "redis://redis:6379"
     job_name = "test_job2"
     job = setup_queue.enqueue(example_task, description=job_name)
 
-    job_data = get_job(redis_url, job.id)
+    job_data = get_job(setup_redis, job.id)
 
     assert job_data.name == job_name
 
 
 def test_delete_job_id(setup_redis, setup_queue):
-    redis_url = "redis://redis:6379"
     job_name = "test_job3"
     job = setup_queue.enqueue(example_task, description=job_name)
 
-    delete_job_id(redis_url, job.id)
+    delete_job_id(setup_redis, job.id)
 
     assert not setup_queue.fetch_job(job.id)
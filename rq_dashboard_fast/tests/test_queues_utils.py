@@ -1,6 +1,7 @@
 import pytest
 from redis import Redis
 from rq import Queue
+from rq.utils import current_timestamp
 
 from ..utils.queues import delete_jobs_for_queue, get_job_registry_amount, get_queues
 
@@ -17,22 +18,20 @@ def example_task():
 
 def test_get_queues(setup_redis):
     # Set up test data
-    redis_url = "redis://redis:6379"
     queue_name = "test_queue"
     queue = Queue(connection=setup_redis, name=queue_name)
 
-    queues = get_queues(redis_url)
+    queues = get_queues(setup_redis)
 
     assert queue in queues
 
 
 def test_get_job_registry_amount(setup_redis):
-    redis_url = "redis://redis:6379"
     queue_name = "test_queue"
     queue = Queue(connection=setup_redis, name=queue_name)
     queue.enqueue(example_task)
 
-    registry_stats = get_job_registry_amount(redis_url)
+    registry_stats = get_job_registry_amount(setup_redis)
 
     assert any(
         stat.queued == 1 and stat.queue_name == queue_name for stat in registry_stats
@@ -40,21 +39,54 @@ def test_get_job_registry_amount(setup_redis):
 
 
 def test_delete_jobs_for_queue(setup_redis):
-    redis_url = "redis://redis:6379"
     queue_name = "test_queue3"
     queue = Queue(connection=setup_redis, name=queue_name)
     queue.enqueue(example_task)
 
-    registry_stats = get_job_registry_amount(redis_url)
+    registry_stats = get_job_registry_amount(setup_redis)
 
     assert any(
         stat.queued == 1 and stat.queue_name == queue_name for stat in registry_stats
     )
 
-    delete_jobs_for_queue(queue_name, redis_url)
+    delete_jobs_for_queue(queue_name, setup_redis)
 
-    registry_stats = get_job_registry_amount(redis_url)
+    registry_stats = get_job_registry_amount(setup_redis)
 
     assert any(
         stat.queued == 0 and stat.queue_name == queue_name for stat in registry_stats
     )
+
+
+def test_delete_jobs_for_queue_removes_job_keys(setup_redis):
+    queue_name = "test_queue4"
+    queue = Queue(connection=setup_redis, name=queue_name)
+    job = queue.enqueue(example_task)
+    queue.enqueue(example_task, depends_on=job)
+
+    assert setup_redis.exists(job.key, job.dependents_key) == 2
+
+    assert delete_jobs_for_queue(queue_name, setup_redis) == 1
+
+    assert setup_redis.exists(job.key, job.dependents_key) == 0
+    assert setup_redis.keys(f"{queue.key}*") == []
+    assert delete_jobs_for_queue(queue_name, setup_redis) == 0
+
+
+def test_get_job_registry_amount_counts_abandoned_jobs_as_failed(setup_redis):
+    queue_name = "test_queue5"
+    queue = Queue(connection=setup_redis, name=queue_name)
+    job = queue.enqueue(example_task)
+    # A worker picked the job up and died; its started entry has expired.
+    queue.remove(job)
+    job.set_status("started")
+    setup_redis.zadd(queue.started_job_registry.key, {job.id: current_timestamp() - 100})
+
+    registry_stats = get_job_registry_amount(setup_redis)
+
+    assert any(
+        stat.queue_name == queue_name and stat.started == 0 and stat.failed == 1
+        for stat in registry_stats
+    )
+    delete_jobs_for_queue(queue_name, setup_redis)
+    queue.failed_job_registry.remove(job, delete_job=True)
@@ -5,10 +5,12 @@ from typing import Any, List
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from redis import Redis
+from rq import Queue
 from rq.job import Job
+from rq.utils import as_text, current_timestamp
 from rq_scheduler import Scheduler
 
-from .queues import get_queues
+from .queues import cleanup_started_registries, get_queues
 
 router = APIRouter()
 
@@ -42,19 +44,35 @@ class QueueJobRegistryStats(BaseModel):
 
 logger = logging.getLogger(__name__)
 
+JOB_STATES = ("queued", "finished", "failed", "started", "deferred", "scheduled")
+
+
+def read_job_ids(pipe, queue: Queue, state: str, now: int):
+    # Registries drop entries scored at or before now on cleanup, so only the
+    # live ones are read.
+    if state == "queued":
+        pipe.lrange(queue.key, 0, -1)
+    elif state == "finished":
+        pipe.zrangebyscore(queue.finished_job_registry.key, f"({now}", "+inf")
+    elif state == "failed":
+        pipe.zrangebyscore(queue.failed_job_registry.key, f"({now}", "+inf")
+    elif state == "started":
+        pipe.zrangebyscore(queue.started_job_registry.key, f"({now}", "+inf")
+    elif state == "deferred":
+        pipe.zrange(queue.deferred_job_registry.key, 0, -1)
+    elif state == "scheduled":
+        pipe.zrange(queue.scheduled_job_registry.key, 0, -1)
+
 
 def get_job_registrys(
-    redis_url: str,
+    redis: Redis,
     queue_name: str = "all",
     state: str = "all",
     page: int = 1,
     per_page: int = 10,
 ) -> List[QueueJobRegistryStats]:
     try:
-        redis = Redis.from_url(redis_url)
-        scheduler = Scheduler(connection=redis, queue_name=queue_name)
-
-        queues = get_queues(redis_url)
+        queues = get_queues(redis)
         result = []
 
         start_index = (page - 1) * per_page
@@ -62,121 +80,133 @@ def get_job_registrys(
 
         scheduled_jobs = []
 
-        for queue in queues:
-            if queue_name == "all" or queue_name == queue.name:
-                jobs = []
-
-                if state == "all":
-                    jobs.extend(queue.get_job_ids())
-                    jobs.extend(queue.finished_job_registry.get_job_ids())
-                    jobs.extend(queue.failed_job_registry.get_job_ids())
-                    jobs.extend(queue.started_job_registry.get_job_ids())
-                    jobs.extend(queue.deferred_job_registry.get_job_ids())
-                    jobs.extend(queue.scheduled_job_registry.get_job_ids())
-                else:
-                    if state == "scheduled":
-                        jobs.extend(queue.scheduled_job_registry.get_job_ids())
-                    elif state == "queued":
-                        jobs.extend(queue.get_job_ids())
-                    elif state == "finished":
-                        jobs.extend(queue.finished_job_registry.get_job_ids())
-                    elif state == "failed":
-                        jobs.extend(queue.failed_job_registry.get_job_ids())
-                    elif state == "started":
-                        jobs.extend(queue.started_job_registry.get_job_ids())
-                    elif state == "deferred":
-                        jobs.extend(queue.deferred_job_registry.get_job_ids())
-
-                started_jobs = []
-                failed_jobs = []
-                deferred_jobs = []
-                finished_jobs = []
-                queued_jobs = []
-                scheduled_jobs = []
-
-                scheduled = scheduler.get_jobs()
-
-                for job in scheduled:
-                    if job.id not in scheduled_jobs:
-                        scheduled_jobs.append(
-                            JobData(
-                                id=job.id,
-                                name=job.description,
-                                created_at=job.created_at,
-                            )
+        scheduled_job_ids = [
+            as_text(job_id)
+            for job_id in redis.zrange(Scheduler.scheduled_jobs_key, 0, -1)
+        ]
+        scheduled = [
+            job
+            for job in Job.fetch_many(scheduled_job_ids, connection=redis)
+            if job is not None
+        ]
+
+        selected_queues = [
+            queue for queue in queues if queue_name == "all" or queue_name == queue.name
+        ]
+        if state == "all":
+            states = JOB_STATES
+        elif state in JOB_STATES:
+            states = (state,)
+        else:
+            states = ()
+
+        # Abandoned started jobs are moved to failed first, so they are
+        # listed there rather than dropped from every state.
+        if "started" in states or "failed" in states:
+            cleanup_started_registries(redis, selected_queues)
+
+        now = current_timestamp()
+        with redis.pipeline(transaction=False) as pipe:
+            for queue in selected_queues:
+                for job_state in states:
+                    read_job_ids(pipe, queue, job_state, now)
+            job_id_lists = pipe.execute()
+
+        for index, queue in enumerate(selected_queues):
+            offset = index * len(states)
+            jobs = []
+            for job_ids in job_id_lists[offset : offset + len(states)]:
+                jobs.extend(as_text(job_id) for job_id in job_ids)
+
+            started_jobs = []
+            failed_jobs = []
+            deferred_jobs = []
+            finished_jobs = []
+            queued_jobs = []
+            scheduled_jobs = []
+
+            for job in scheduled:
+                if job.id not in scheduled_jobs:
+                    scheduled_jobs.append(
+                        JobData(
+                            id=job.id,
+                            name=job.description,
+                            created_at=job.created_at,
                         )
+                    )
 
-                jobs_fetched = Job.fetch_many(jobs, connection=redis)
-
-                started_jobs = []
-                failed_jobs = []
-                deferred_jobs = []
-                finished_jobs = []
-                queued_jobs = []
-
-                jobs = jobs_fetched[start_index:end_index]
-                for job in jobs:
-                    status = job.get_status()
-                    if status == "started":
-                        started_jobs.append(
-                            JobData(
-                                id=job.id,
-                                name=job.description,
-                                created_at=job.created_at,
-                            )
+            jobs_fetched = Job.fetch_many(jobs[start_index:end_index], connection=redis)
+
+            started_jobs = []
+            failed_jobs = []
+            deferred_jobs = []
+            finished_jobs = []
+            queued_jobs = []
+
+            for job in jobs_fetched:
+                if job is None:
+                    continue
+                status = job.get_status(refresh=False)
+                if status == "started":
+                    started_jobs.append(
+                        JobData(
+                            id=job.id,
+                            name=job.description,
+                            created_at=job.created_at,
                         )
-                    elif status == "failed":
-                        failed_jobs.append(
-                            JobData(
-                                id=job.id,
-                                name=job.description,
-                                created_at=job.created_at,
-                            )
+                    )
+                elif status == "failed":
+                    failed_jobs.append(
+                        JobData(
+                            id=job.id,
+                            name=job.description,
+                            created_at=job.created_at,
                         )
-                    elif status == "deferred":
-                        deferred_jobs.append(
-                            JobData(
-                                id=job.id,
-                                name=job.description,
-                                created_at=job.created_at,
-                            )
+                    )
+                elif status == "deferred":
+                    deferred_jobs.append(
+                        JobData(
+                            id=job.id,
+                            name=job.description,
+                            created_at=job.created_at,
                         )
-                    elif status == "finished":
-                        finished_jobs.append(
-                            JobData(
-                                id=job.id,
-                                name=job.description,
-                                created_at=job.created_at,
-                            )
+                    )
+                elif status == "finished":
+                    finished_jobs.append(
+                        JobData(
+                            id=job.id,
+                            name=job.description,
+                            created_at=job.created_at,
                         )
-                    elif status == "queued":
-                        queued_jobs.append(
-                            JobData(
-                                id=job.id,
-                                name=job.description,
-                                created_at=job.created_at,
-                            )
+                    )
+                elif status == "queued":
+                    queued_jobs.append(
+                        JobData(
+                            id=job.id,
+                            name=job.description,
+                            created_at=job.created_at,
                         )
-                    elif status == "scheduled":
-                        scheduled_jobs.append(
-                            JobData(
-                                id=job.id,
-                                name=job.description,
-                                created_at=job.created_at,
-                            )
+                    )
+                elif status == "scheduled":
+                    scheduled_jobs.append(
+                        JobData(
+                            id=job.id,
+                            name=job.description,
+                            created_at=job.created_at,
                         )
-
-                result.append(
-                    QueueJobRegistryStats(
-                        queue_name=queue.name,
-                        scheduled=scheduled_jobs,
-                        queued=queued_jobs,
-                        started=started_jobs,
-                        failed=failed_jobs,
-                        deferred=deferred_jobs,
-                        finished=finished_jobs,
                     )
+
+            result.append(
+                QueueJobRegistryStats(
+                    queue_name=queue.name,
+                    scheduled=scheduled_jobs,
+                    queued=queued_jobs,
+                    started=started_jobs,
+                    failed=failed_jobs,
+                    deferred=deferred_jobs,
+                    finished=finished_jobs,
                 )
+            )
 
         return result
     except Exception as error:
@@ -187,10 +217,10 @@ def get_job_registrys(
 
 
 def get_jobs(
-    redis_url: str, queue_name: str = "all", state: str = "all", page: int = 1
+    redis: Redis, queue_name: str = "all", state: str = "all", page: int = 1
 ) -> list[QueueJobRegistryStats]:
     try:
-        job_stats = get_job_registrys(redis_url, queue_name, state, page)
+        job_stats = get_job_registrys(redis, queue_name, state, page)
         return job_stats
     except Exception as error:
         logger.exception("Error fetching job data: ", error)
@@ -199,9 +229,8 @@ def get_jobs(
         )
 
 
-def get_job(redis_url: str, job_id: str) -> JobDataDetailed:
+def get_job(redis: Redis, job_id: str) -> JobDataDetailed:
     try:
-        redis = Redis.from_url(redis_url)
         job = Job.fetch(job_id, connection=redis)
 
         return JobDataDetailed(
@@ -219,9 +248,8 @@ def get_job(redis_url: str, job_id: str) -> JobDataDetailed:
         raise HTTPException(status_code=500, detail=str("Error fetching job: ", error))
 
 
-def delete_job_id(redis_url: str, job_id: str):
+def delete_job_id(redis: Redis, job_id: str):
     try:
-        redis = Redis.from_url(redis_url)
         job = Job.fetch(job_id, connection=redis)
         if job:
             job.delete()
@@ -1,9 +1,13 @@
 import logging
+from uuid import uuid4
 
 from fastapi import HTTPException
 from pydantic import BaseModel
 from redis import Redis
+from redis.commands.core import Script
+from redis.exceptions import ResponseError
 from rq import Queue
+from rq.utils import as_text, current_timestamp
 
 
 class QueueRegistryStats(BaseModel):
@@ -17,11 +21,31 @@ class QueueRegistryStats(BaseModel):
 
 logger = logging.getLogger(__name__)
 
-
-def get_queues(redis_url: str) -> list[Queue]:
+# Counts the jobs of every queue passed in KEYS (five keys per queue) in a single
+# call. Registries drop entries scored at or before now on cleanup, so only the
+# live ones are counted.
+COUNT_REGISTRIES_SCRIPT = """
+local live = "(" .. ARGV[1]
+local counts = {}
+for i = 1, #KEYS, 5 do
+    counts[#counts + 1] = redis.call("LLEN", KEYS[i])
+    counts[#counts + 1] = redis.call("ZCOUNT", KEYS[i + 1], live, "+inf")
+    counts[#counts + 1] = redis.call("ZCOUNT", KEYS[i + 2], live, "+inf")
+    counts[#counts + 1] = redis.call("ZCARD", KEYS[i + 3])
+    counts[#counts + 1] = redis.call("ZCOUNT", KEYS[i + 4], live, "+inf")
+end
+return counts
+"""
+
+# Hashed once at import; each call passes its own client, and EVALSHA falls back
+# to loading the script the first time a server has not seen it.
+count_registries = Script(None, COUNT_REGISTRIES_SCRIPT.encode())
+
+DELETE_BATCH_SIZE = 5000
+
+
+def get_queues(redis: Redis) -> list[Queue]:
     try:
-        redis = Redis.from_url(redis_url)
-
         queues = Queue.all(connection=redis)
 
         return queues
@@ -33,16 +57,54 @@ def get_queues(redis_url: str) -> list[Queue]:
         )
 
 
-def get_job_registry_amount(redis_url: str) -> list[QueueRegistryStats]:
+def cleanup_started_registries(redis: Redis, queues: list[Queue]) -> None:
+    # Started jobs whose worker died expire in the started registry; RQ's
+    # cleanup moves them to the failed registry. Reading the registries
+    # through RQ used to trigger it, so it runs here for the queues that have
+    # expired entries, which one pipelined ZCOUNT finds.
+    now = current_timestamp()
+    with redis.pipeline(transaction=False) as pipe:
+        for queue in queues:
+            pipe.zcount(queue.started_job_registry.key, "-inf", now)
+        expired_counts = pipe.execute()
+
+    for queue, expired in zip(queues, expired_counts):
+        if expired:
+            queue.started_job_registry.cleanup(now)
+
+
+def get_job_registry_amount(redis: Redis) -> list[QueueRegistryStats]:
     try:
-        queues = get_queues(redis_url)
-        result = []
+        queues = get_queues(redis)
+        cleanup_started_registries(redis, queues)
+
+        keys = []
         for queue in queues:
-            finished_jobs = len(queue.finished_job_registry.get_job_ids())
-            started_jobs = len(queue.started_job_registry.get_job_ids())
-            failed_jobs = len(queue.failed_job_registry.get_job_ids())
-            deferred_jobs = len(queue.deferred_job_registry.get_job_ids())
-            queued_jobs = len(queue.get_job_ids())
+            keys.extend(
+                [
+                    queue.key,
+                    queue.started_job_registry.key,
+                    queue.failed_job_registry.key,
+                    queue.deferred_job_registry.key,
+                    queue.finished_job_registry.key,
+                ]
+            )
+
+        counts = []
+        if keys:
+            counts = count_registries(
+                keys=keys, args=[current_timestamp()], client=redis
+            )
+
+        result = []
+        for index, queue in enumerate(queues):
+            (
+                queued_jobs,
+                started_jobs,
+                failed_jobs,
+                deferred_jobs,
+                finished_jobs,
+            ) = counts[index * 5 : index * 5 + 5]
 
             result.append(
                 QueueRegistryStats(
@@ -62,15 +124,35 @@ def get_job_registry_amount(redis_url: str) -> list[QueueRegistryStats]:
         )
 
 
-def delete_jobs_for_queue(queue_name, redis_url) -> list[str]:
+def delete_jobs_for_queue(queue_name, redis: Redis) -> int:
     try:
-        redis = Redis.from_url(redis_url)
-
         queue = Queue(queue_name, connection=redis)
+        job_prefix = queue.job_class.redis_job_namespace_prefix
+
+        # Renaming detaches the job list atomically; jobs enqueued from here on
+        # start a new list and are left alone.
+        deleting_key = f"{queue.key}:deleting:{uuid4().hex}"
+        try:
+            redis.rename(queue.key, deleting_key)
+        except ResponseError as error:
+            if "no such key" not in str(error).lower():
+                raise
+            return 0
+
+        job_ids = [as_text(job_id) for job_id in redis.lrange(deleting_key, 0, -1)]
+
+        # UNLINK frees the job hashes in the background instead of blocking Redis.
+        pipe = redis.pipeline(transaction=False)
+        for start in range(0, len(job_ids), DELETE_BATCH_SIZE):
+            batch = job_ids[start : start + DELETE_BATCH_SIZE]
+            pipe.unlink(
+                *(f"{job_prefix}{job_id}" for job_id in batch),
+                *(f"{job_prefix}{job_id}:dependents" for job_id in batch),
+            )
+        pipe.unlink(deleting_key)
+        pipe.execute()
 
-        result = queue.empty()
-
-        return result
+        return len(job_ids)
     except Exception as error:
         logger.exception("Error deleting jobs in queue: ", error)
         raise HTTPException(
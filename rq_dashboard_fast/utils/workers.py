@@ -4,6 +4,9 @@ from fastapi import HTTPException
 from pydantic import BaseModel
 from redis import Redis
 from rq import Worker
+from rq.job import Job
+from rq.utils import as_text
+from rq.worker_registration import get_keys
 
 logger = logging.getLogger(__name__)
 
@@ -17,34 +20,69 @@ class WorkerData(BaseModel):
     queues: list[str]
 
 
-def get_workers(redis_url: str) -> list[WorkerData]:
+def get_workers(redis: Redis) -> list[WorkerData]:
     try:
-        redis = Redis.from_url(redis_url)
-        workers = Worker.all(connection=redis)
+        worker_keys = sorted(get_keys(connection=redis))
+
+        with redis.pipeline(transaction=False) as pipe:
+            for worker_key in worker_keys:
+                pipe.hmget(
+                    worker_key,
+                    "queues",
+                    "current_job",
+                    "successful_job_count",
+                    "failed_job_count",
+                )
+            worker_fields = pipe.execute()
+
+        # Keys of workers that died without cleaning up have no hash left.
+        workers = [
+            (worker_key[len(Worker.redis_worker_namespace_prefix) :], *fields)
+            for worker_key, fields in zip(worker_keys, worker_fields)
+            if any(fields)
+        ]
+
+        current_job_ids = [
+            as_text(current_job_id)
+            for _, _, current_job_id, _, _ in workers
+            if current_job_id
+        ]
+        current_jobs = {
+            job.id: job
+            for job in Job.fetch_many(current_job_ids, connection=redis)
+            if job is not None
+        }
+
         result = []
 
-        for worker in workers:
-            current_job = worker.get_current_job()
+        for name, queues, current_job_id, successful, failed in workers:
+            current_job = (
+                current_jobs.get(as_text(current_job_id)) if current_job_id else None
+            )
+            queue_names = as_text(queues).split(",") if queues else []
+            successful_job_count = int(successful) if successful else 0
+            failed_job_count = int(failed) if failed else 0
+
             if current_job is not None:
                 result.append(
                     WorkerData(
-                        name=worker.name,
+                        name=name,
                         current_job=current_job.description,
                         current_job_id=current_job.id,
-                        successful_job_count=worker.successful_job_count,
-                        failed_job_count=worker.failed_job_count,
-                        queues=worker.queue_names(),
+                        successful_job_count=successful_job_count,
+                        failed_job_count=failed_job_count,
+                        queues=queue_names,
                     )
                 )
             else:
                 result.append(
                     WorkerData(
-                        name=worker.name,
+                        name=name,
                         current_job="Idle",
                         current_job_id=None,
-                        successful_job_count=worker.successful_job_count,
-                        failed_job_count=worker.failed_job_count,
-                        queues=worker.queue_names(),
+                        successful_job_count=successful_job_count,
+                        failed_job_count=failed_job_count,
+                        queues=queue_names,
                     )
                 )
 